@@ -16,8 +16,10 @@ st.markdown(
 """
 )
 
-# Check authentication
-auth.set_st_state_vars()
+# Check authentication (once per session; later reruns reuse the session state)
+if '_auth_initialized' not in st.session_state:
+    auth.set_st_state_vars()
+    st.session_state['_auth_initialized'] = True
 
 # Login/logout button
 if st.session_state["authenticated"]:
@@ -5,54 +5,119 @@ API Script
 This script contains the main functions for making API calls to the DreamDX AI.
 """
 
-import os
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 import streamlit as st
-from dotenv import load_dotenv
 from requests.adapters import HTTPAdapter
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 from urllib3.util import Retry
 
-load_dotenv(dotenv_path="config/.env")
+from components.config import env
 
 # Load the API base URL from environment variables
-API_BASE_URL = os.getenv("API_BASE_URL")
+API_BASE_URL = env()["API_BASE_URL"]
 
 # Validate that the API_BASE_URL is set
 if not API_BASE_URL:
     st.error("API_BASE_URL is not set. Please check your environment configuration.")
     st.stop()
 
-def call_api(endpoint, payload, max_retries=3, backoff_factor=0.3):
+# Default retry policy for API calls. The random jitter added to each backoff
+# keeps concurrent requests from retrying in lockstep.
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.1
+DEFAULT_BACKOFF_JITTER = 0.3
+
+# Maximum number of narratives deleted per API call (DynamoDB BatchWriteItem limit)
+DELETE_BATCH_SIZE = 25
+
+# Maximum number of delete batches sent to the API at once
+DELETE_MAX_CONCURRENCY = 10
+
+# Worker threads for fire-and-forget API calls
+_BACKGROUND_EXECUTOR = ThreadPoolExecutor(max_workers=4)
+
+# (connect, read) timeouts in seconds for API calls
+REQUEST_TIMEOUT = (3.05, 30)
+
+def _build_session(max_retries, backoff_factor, idempotent=True):
     """
-    Helper function to call the API and handle errors with retries.
-    
+    Builds a requests session with a pooled, retry-enabled HTTP adapter.
+
     Args:
-        endpoint (str): The relative API endpoint to call (e.g., "/dev/dream/start").
-        payload (dict): The payload to send with the request.
         max_retries (int): The maximum number of retry attempts.
         backoff_factor (float): A backoff factor to apply between attempts.
+        idempotent (bool): Whether the calls made with the session are safe to resend.
+            If not, only connection errors (raised before the request is sent) are retried.
 
     Returns:
-        dict or None: The JSON response from the API, or None if an error occurred.
+        requests.Session: The configured session.
     """
-    # Create a session
     session = requests.Session()
     
     # Set up retries
-    retries = Retry(total=max_retries, backoff_factor=backoff_factor, 
-                    status_forcelist=[500, 502, 503, 504])
+    if idempotent:
+        retries = Retry(total=max_retries, connect=max_retries, read=max_retries,
+                        backoff_factor=backoff_factor,
+                        backoff_jitter=DEFAULT_BACKOFF_JITTER,
+                        status_forcelist=[429, 500, 502, 503, 504, 529],
+                        allowed_methods=frozenset({"POST"}),
+                        respect_retry_after_header=True)
+    else:
+        # A read timeout or 5xx can mean the backend is still processing the call
+        retries = Retry(total=max_retries, connect=max_retries, read=0, other=0,
+                        backoff_factor=backoff_factor,
+                        backoff_jitter=DEFAULT_BACKOFF_JITTER)
     
     # Mount it for HTTPAdapter
-    adapter = HTTPAdapter(max_retries=retries)
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retries)
     session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+@st.cache_resource(show_spinner=False)
+def get_session(idempotent=True):
+    """
+    Returns the session shared across all Streamlit sessions, so connections
+    to the API are kept alive and reused between calls.
+
+    Args:
+        idempotent (bool): Whether the calls made with the session are safe to resend.
+
+    Returns:
+        requests.Session: The shared session.
+    """
+    return _build_session(DEFAULT_MAX_RETRIES, DEFAULT_BACKOFF_FACTOR, idempotent)
+
+def call_api(endpoint, payload, max_retries=DEFAULT_MAX_RETRIES,
+             backoff_factor=DEFAULT_BACKOFF_FACTOR, idempotent=True):
+    """
+    Helper function to call the API and handle errors with retries.
+    
+    Args:
+        endpoint (str): The relative API endpoint to call (e.g., "/dev/dream/start").
+        payload (dict): The payload to send with the request.
+        max_retries (int): The maximum number of retry attempts.
+        backoff_factor (float): A backoff factor to apply between attempts.
+        idempotent (bool): Whether the call is safe to resend after a timeout or server error.
+
+    Returns:
+        dict or None: The JSON response from the API, or None if an error occurred.
+    """
+    # Reuse the shared session unless the caller overrides the retry policy
+    if max_retries == DEFAULT_MAX_RETRIES and backoff_factor == DEFAULT_BACKOFF_FACTOR:
+        session = get_session(idempotent)
+    else:
+        session = _build_session(max_retries, backoff_factor, idempotent)
     
     # Complete URL with base URL
     url = f"{API_BASE_URL}{endpoint}"
     
+    response = None
     try:
         # Send the POST request to the API endpoint
-        response = session.post(url, json=payload)
+        response = session.post(url, json=payload, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()  # Will raise an HTTPError for bad responses (4xx, 5xx)
         return response.json()
     
@@ -81,6 +146,36 @@ def call_api(endpoint, payload, max_retries=3, backoff_factor=0.3):
     except requests.exceptions.RequestException as req_err:
         st.error(f"An unexpected error occurred: {req_err}")
         return None
+    
+    finally:
+        # Return the connection to the pool right away
+        if response is not None:
+            response.close()
+
+def run_concurrently(*calls, max_workers=None):
+    """
+    Runs independent API calls concurrently over the shared session.
+
+    Args:
+        *calls (tuple): (function, args) pairs, e.g. (get_user_narratives, (user_id,)).
+        max_workers (int): The maximum number of calls in flight at once (default: all of them).
+
+    Returns:
+        list: The result of each call, in the same order as the calls.
+    """
+    if not calls:
+        return []
+
+    ctx = get_script_run_ctx()
+
+    def run(call):
+        # Attach the Streamlit script context so st.error works from worker threads
+        add_script_run_ctx(ctx=ctx)
+        func, args = call
+        return func(*args)
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(calls)) as executor:
+        return list(executor.map(run, calls))
 
 def start_narrative(user_id, session_id, narrative_input):
     """
@@ -101,7 +196,12 @@ def start_narrative(user_id, session_id, narrative_input):
         'session_id': session_id,
         'user_id': user_id
     }
-    return call_api(endpoint, payload)
+    # Starting a narrative isn't idempotent: a resend would fail as "already exists"
+    response = call_api(endpoint, payload, idempotent=False)
+    if response:
+        _fetch_user_narratives.clear(user_id)
+        _fetch_user_session_ids.clear(user_id)
+    return response
 
 def continue_narrative(user_id, session_id, narrative_input):
     """
@@ -122,7 +222,13 @@ def continue_narrative(user_id, session_id, narrative_input):
         'session_id': session_id,
         'user_id': user_id
     }
-    return call_api(endpoint, payload)
+    # Continuing a narrative isn't idempotent: a resend would append the turn twice
+    response = call_api(endpoint, payload, idempotent=False)
+    if response:
+        # The listed date and timestamp change too; the narrative names don't
+        _fetch_user_narratives.clear(user_id)
+        _fetch_narrative_content.clear(user_id, session_id)
+    return response
 
 def wake_up():
     """
@@ -137,6 +243,44 @@ def wake_up():
     }
     return call_api(endpoint, payload)
 
+def wake_up_in_background():
+    """
+    Sends the 'wake up' command without waiting for the response.
+
+    Returns:
+        concurrent.futures.Future: The pending API call.
+    """
+    return _BACKGROUND_EXECUTOR.submit(wake_up)
+
+class _APICallFailed(Exception):
+    """
+    Raised by the cached API calls when call_api fails. st.cache_data doesn't
+    store exceptions, so a failed call is never memoized and is retried on the
+    next lookup.
+    """
+
+def _call_api_or_raise(endpoint, payload):
+    """
+    Calls the API like call_api, but raises _APICallFailed instead of returning None.
+    """
+    response = call_api(endpoint, payload)
+    if response is None:
+        raise _APICallFailed(endpoint)
+    return response
+
+# Cached for longer since every call that changes a user's list clears that user's entry
+@st.cache_data(ttl=300, show_spinner=False)
+def _fetch_user_narratives(user_id):
+    """
+    Cached API call behind get_user_narratives. Raises _APICallFailed on errors.
+    """
+    endpoint = '/dev/narratives/get-narratives'
+    payload = {
+        'command': 'get narratives',
+        'user_id': user_id
+    }
+    return _call_api_or_raise(endpoint, payload)
+
 def get_user_narratives(user_id):
     """
     Retrieves the narratives for a given user.
@@ -147,12 +291,42 @@ def get_user_narratives(user_id):
     Returns:
         dict: The JSON response from the API, or None if an error occurred.
     """
-    endpoint = '/dev/narratives/get-narratives'
-    payload = {
-        'command': 'get narratives',
-        'user_id': user_id
-    }
-    return call_api(endpoint, payload)
+    try:
+        return _fetch_user_narratives(user_id)
+    except _APICallFailed:
+        return None
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _fetch_user_session_ids(user_id):
+    """
+    Cached API call behind get_user_session_ids. Raises _APICallFailed on errors.
+    """
+    return frozenset(narrative['session_id'] for narrative in _fetch_user_narratives(user_id))
+
+def get_user_session_ids(user_id):
+    """
+    Retrieves the set of narrative names (session IDs) for a given user.
+
+    Args:
+        user_id (str): The ID of the user (email).
+
+    Returns:
+        frozenset: The session IDs of the user's narratives, or None if an error occurred.
+    """
+    try:
+        return _fetch_user_session_ids(user_id)
+    except _APICallFailed:
+        return None
+
+def prefetch_user_narratives(user_id):
+    """
+    Warms the narratives cache for a user in a background thread, so the first
+    lookup on the page doesn't wait for the API.
+
+    Args:
+        user_id (str): The ID of the user (email).
+    """
+    _BACKGROUND_EXECUTOR.submit(get_user_session_ids, user_id)
 
 def delete_narrative(user_id, session_id):
     """ 
@@ -171,18 +345,55 @@ def delete_narrative(user_id, session_id):
         'session_id': session_id,
         'user_id': user_id
     }
-    return call_api(endpoint, payload)
+    response = call_api(endpoint, payload)
+    if response:
+        _fetch_user_narratives.clear(user_id)
+        _fetch_user_session_ids.clear(user_id)
+        _fetch_narrative_content.clear(user_id, session_id)
+    return response
 
-def get_narrative_content(user_id, session_id):
+def delete_narratives_batch(user_id, session_ids):
     """
-    Retrieves the content of a specific narrative.
+    Deletes several narratives for a given user, in batches of up to
+    DELETE_BATCH_SIZE narratives per API call. Batches are sent concurrently.
 
     Args:
         user_id (str): The ID of the user (email).
-        session_id (str): The ID of the narrative session.
+        session_ids (list): The IDs of the narratives to delete.
 
     Returns:
-        dict: The narrative content including prompts and descriptions.
+        list: The IDs of the narratives that were deleted.
+    """
+    # The Lambda routes on the 'command' field, so the batch goes through the delete route
+    endpoint = '/dev/narratives/delete'
+    session_ids = list(session_ids)
+    batches = [session_ids[start:start + DELETE_BATCH_SIZE]
+               for start in range(0, len(session_ids), DELETE_BATCH_SIZE)]
+    calls = [
+        (call_api, (endpoint, {'command': 'delete narratives', 'session_ids': batch, 'user_id': user_id}))
+        for batch in batches
+    ]
+
+    # Send the batches concurrently, bounded so the backend isn't overwhelmed
+    responses = run_concurrently(*calls, max_workers=DELETE_MAX_CONCURRENCY)
+
+    deleted = []
+    for batch, response in zip(batches, responses):
+        if response and 'message' in response:
+            deleted.extend(response.get('session_ids', batch))
+
+    if deleted:
+        _fetch_user_narratives.clear(user_id)
+        _fetch_user_session_ids.clear(user_id)
+        for session_id in deleted:
+            _fetch_narrative_content.clear(user_id, session_id)
+    return deleted
+
+# Narrative content only changes through calls that clear this cache
+@st.cache_data(ttl=600, show_spinner=False)
+def _fetch_narrative_content(user_id, session_id):
+    """
+    Cached API call behind get_narrative_content. Raises _APICallFailed on errors.
     """
     endpoint = "/dev/narratives/get-content"
     payload = {
@@ -191,4 +402,20 @@ def get_narrative_content(user_id, session_id):
         "session_id": session_id
     }
     
-    return call_api(endpoint, payload)
\ No newline at end of file
+    return _call_api_or_raise(endpoint, payload)
+
+def get_narrative_content(user_id, session_id):
+    """
+    Retrieves the content of a specific narrative.
+
+    Args:
+        user_id (str): The ID of the user (email).
+        session_id (str): The ID of the narrative session.
+
+    Returns:
+        dict: The narrative content including prompts and descriptions, or None if an error occurred.
+    """
+    try:
+        return _fetch_narrative_content(user_id, session_id)
+    except _APICallFailed:
+        return None
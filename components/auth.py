@@ -14,21 +14,44 @@ Refereces:
 - https://docs.aws.amazon.com/cognito/latest/developerguide/token-endpoint.html
 """
 
+import atexit
 import base64 # noqa
 import json # noqa
-import os
 import jwt
 
 import requests # noqa
 import streamlit as st
-from dotenv import load_dotenv
+
+from components.config import env
 
 # Load environment variables
-load_dotenv(dotenv_path="config/.env")
-COGNITO_DOMAIN = os.environ.get("COGNITO_DOMAIN")
-CLIENT_ID = os.environ.get("CLIENT_ID")
-CLIENT_SECRET = os.environ.get("CLIENT_SECRET")
-APP_URI = os.environ.get("APP_URI")
+COGNITO_DOMAIN = env()["COGNITO_DOMAIN"]
+CLIENT_ID = env()["CLIENT_ID"]
+CLIENT_SECRET = env()["CLIENT_SECRET"]
+APP_URI = env()["APP_URI"]
+
+# Headers for the token endpoint; the client credentials don't change at runtime
+BASIC_AUTH = "Basic " + base64.b64encode(f"{CLIENT_ID}:{CLIENT_SECRET}".encode("utf-8")).decode("utf-8")
+AUTH_HEADERS = {
+    "Content-Type": "application/x-www-form-urlencoded",
+    "Authorization": BASIC_AUTH
+}
+
+# Timeout in seconds for requests to Cognito
+AUTH_TIMEOUT = 10.0
+
+@st.cache_resource(show_spinner=False)
+def get_auth_session():
+    """
+    Returns the session shared across all Streamlit sessions, so connections
+    to Cognito are kept alive between token requests.
+
+    Returns:
+        requests.Session: The shared session.
+    """
+    session = requests.Session()
+    atexit.register(session.close)
+    return session
 
 def decode_id_token(id_token):
     """
@@ -57,6 +80,8 @@ def initialise_st_state_vars():
         st.session_state["authenticated"] = False
     if "user_email" not in st.session_state:
         st.session_state["user_email"] = ""
+    if "access_token" not in st.session_state:
+        st.session_state["access_token"] = ""
 
 def get_auth_code():
     """
@@ -89,13 +114,6 @@ def get_user_token(auth_code):
     """
     # Variables to be used in the POST request
     token_url = f"{COGNITO_DOMAIN}/oauth2/token"
-    client_secret_string = f"{CLIENT_ID}:{CLIENT_SECRET}"
-    client_secret_encoded = str(
-        base64.b64encode(client_secret_string.encode("utf-8")), "utf-8")
-    auth_header = {
-        "Content-Type": "application/x-www-form-urlencoded",
-        "Authorization": f"Basic {client_secret_encoded}"
-        }
     auth_body = {
         "grant_type": "authorization_code",
         "client_id": CLIENT_ID,
@@ -103,8 +121,13 @@ def get_user_token(auth_code):
         "redirect_uri": APP_URI
     }
     # Send POST request
-    token_response = requests.post(token_url,
-                                   headers=auth_header, data=auth_body)
+    try:
+        token_response = get_auth_session().post(token_url, headers=AUTH_HEADERS,
+                                                 data=auth_body, timeout=AUTH_TIMEOUT)
+    except requests.exceptions.RequestException:
+        access_token = ""
+        id_token = ""
+        return access_token, id_token
 
     if token_response.status_code != 200:
         access_token = ""
@@ -144,10 +167,15 @@ def set_st_state_vars():
     
     if not st.session_state["authenticated"]:
         auth_code = get_auth_code()
-        access_token, id_token = get_user_token(auth_code)
+        if auth_code:
+            access_token, id_token = get_user_token(auth_code)
+        else:
+            # No authorization code in the URL, skip the token request
+            access_token, id_token = "", ""
         
         if access_token != "":
             st.session_state["auth_code"] = auth_code
+            st.session_state["access_token"] = access_token
             st.session_state["authenticated"] = True
             
             # Decode the ID token and extract user information
@@ -160,8 +188,9 @@ def set_st_state_vars():
             st.session_state["authenticated"] = False
             st.session_state["user_email"] = ""
 
-    # Debug: Print session state
-    st.write("Debug - Session State:", st.session_state)
+    # Debug: Print session state (only with DREAMDX_DEBUG=1)
+    if env()["DEBUG"]:
+        st.write("Debug - Session State:", st.session_state)
     
 ### --- Login/logout components --- ###
 
@@ -205,7 +234,7 @@ def button_login():
     Returns:
         Html of the login button.
     """
-    return st.sidebar.markdown(f"{html_button_login}", unsafe_allow_html=True)
+    return st.sidebar.markdown(html_button_login, unsafe_allow_html=True)
 
 
 def button_logout():
@@ -214,4 +243,4 @@ def button_logout():
     Returns:
         Html of the logout button.
     """
-    return st.sidebar.markdown(f"{html_button_logout}", unsafe_allow_html=True)
\ No newline at end of file
+    return st.sidebar.markdown(html_button_logout, unsafe_allow_html=True)
\ No newline at end of file
@@ -0,0 +1,31 @@
+"""
+Config Script
+=============
+
+This script loads the DreamDX AI configuration from the environment variables
+(and the `config/.env` file) once per process.
+"""
+
+import os
+from functools import lru_cache
+
+from dotenv import load_dotenv
+
+
+@lru_cache(maxsize=1)
+def env():
+    """
+    Loads the environment configuration. The `.env` file is only read on the first call.
+
+    Returns:
+        dict: The configuration values, or None for the variables that are not set.
+    """
+    load_dotenv(dotenv_path="config/.env")
+    return {
+        "API_BASE_URL": os.getenv("API_BASE_URL"),
+        "COGNITO_DOMAIN": os.getenv("COGNITO_DOMAIN"),
+        "CLIENT_ID": os.getenv("CLIENT_ID"),
+        "CLIENT_SECRET": os.getenv("CLIENT_SECRET"),
+        "APP_URI": os.getenv("APP_URI"),
+        "DEBUG": os.getenv("DREAMDX_DEBUG") == "1",
+    }
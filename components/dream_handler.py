@@ -12,16 +12,25 @@ for later retrieval.
 
 """
 
+import hashlib
 import json
+import random
 import time
 from datetime import datetime
 from decimal import Decimal
 
 import boto3
+import openai
 from boto3.dynamodb.conditions import Attr, Key
-from langchain.prompts import ChatPromptTemplate
+from botocore.config import Config
+from botocore.exceptions import ClientError
 from langchain_openai import ChatOpenAI
 
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library if orjson isn't packaged in the Lambda layer
+    orjson = None
+
 # Define prompt templates for generating and continuing narratives
 INITIAL_PROMPT_TEMPLATE = """
 Based on the following context, generate a descriptive environment for the beginning of a narrative:
@@ -36,6 +45,10 @@ Remember:
 Description:
 """
 
+# The initial template has a single {context} slot, so it is split once and
+# formatted by concatenation instead of going through a LangChain template
+INITIAL_PROMPT_PREFIX, INITIAL_PROMPT_SUFFIX = INITIAL_PROMPT_TEMPLATE.split("{context}")
+
 CONTINUATION_PROMPT_TEMPLATE = """
 Continue the narrative focusing on the immediate next action and the current scene.
 - Keep the narrative short but informative about the scene, no more than 100 words.
@@ -45,13 +58,63 @@ Continue the narrative focusing on the immediate next action and the current sce
 - Introduce new elements and unexpected twists to make the narrative more engaging.
 """
 
-# Initialize the language model once for efficiency
-model = ChatOpenAI(model="gpt-4o-mini")
+SUMMARY_PROMPT_TEMPLATE = """
+Summarize the following dream narrative in no more than 120 words.
+Keep the current scene, the characters and the important objects.
+
+{narrative}
+---
 
-# Set up DynamoDB resource and table reference for storing narratives
-dynamodb = boto3.resource('dynamodb')
+Summary:
+"""
+
+# Maximum number of words of previous narrative kept as context for continuations
+MAX_CONTEXT_WORDS = 600
+
+# Number of turns between summaries of the rolling context
+SUMMARY_INTERVAL = 6
+
+# Seconds a cached model response is kept. Items carry an 'expires_at' attribute
+# so DynamoDB TTL can remove them from the cache table.
+LLM_CACHE_TTL = 15 * 60
+
+# Timeout in seconds for a single model request
+LLM_TIMEOUT = 10.0
+
+# API Gateway ends requests after 29 s. All model calls of a request must finish
+# REQUEST_TIME_MARGIN seconds before that, leaving time for the DynamoDB calls.
+API_GATEWAY_TIMEOUT = 29.0
+REQUEST_TIME_MARGIN = 5.0
+
+# Retry policy for model calls: jittered exponential backoff, with no attempt started
+# unless it can finish before the request deadline
+LLM_BACKOFF_BASE = 1.0
+LLM_BACKOFF_CAP = 8.0
+
+# OpenAI errors worth retrying: rate limits, timeouts, connection errors and server errors
+RETRYABLE_LLM_ERRORS = (openai.RateLimitError, openai.APITimeoutError,
+                        openai.APIConnectionError, openai.InternalServerError)
+
+# Initialize the language model once for efficiency.
+# Retries are handled by invoke_with_backoff.
+MODEL_NAME = "gpt-4o-mini"
+model = ChatOpenAI(model=MODEL_NAME, timeout=LLM_TIMEOUT, max_retries=0)
+
+# Set up DynamoDB resource and table reference for storing narratives.
+# Keep these at module level so warm Lambda invocations reuse the same connections.
+# Connections are kept alive and throttling is absorbed with adaptive retries.
+dynamodb = boto3.resource('dynamodb', config=Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    retries={"max_attempts": 5, "mode": "adaptive"},
+    connect_timeout=3,
+    read_timeout=10
+))
 narrative_table = dynamodb.Table('dreamdx-narratives')  # Replace with actual table name
 
+# Table used to cache model responses, keyed by model name, narrative and prompt
+llm_cache_table = dynamodb.Table('dreamdx-llm-cache')  # Replace with actual table name
+
 def decimal_default(obj):
     """
     Custom JSON encoder to handle Decimal objects.
@@ -63,101 +126,315 @@ def decimal_default(obj):
         return float(obj)
     raise TypeError
 
-def start_narrative(user_id, session_id, context):
+def json_loads(data):
+    """
+    Parses a JSON string, using orjson when available.
+
+    Raises json.JSONDecodeError on invalid input (orjson's error subclasses it).
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def json_dumps(obj):
+    """
+    Serializes an object to a JSON string, using orjson when available.
+    Decimal objects are converted with decimal_default.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=decimal_default).decode("utf-8")
+    return json.dumps(obj, default=decimal_default)
+
+def decimals_to_float(obj):
+    """
+    Recursively converts Decimal objects returned by DynamoDB to floats,
+    without a JSON serialize/parse round trip.
+    """
+    if isinstance(obj, list):
+        return [decimals_to_float(value) for value in obj]
+    if isinstance(obj, dict):
+        return {key: decimals_to_float(value) for key, value in obj.items()}
+    if isinstance(obj, Decimal):
+        return float(obj)
+    return obj
+
+def llm_cache_key(prompt, user_id, session_id):
+    """
+    Builds the cache key for a prompt sent for a narrative.
+
+    The model name is part of the key so switching models never serves
+    responses generated by a previous one. The user and session are part of it
+    so the cache only serves resends of the same request, never another
+    user's narrative.
+    """
+    return hashlib.blake2b(f"{MODEL_NAME}|{user_id}|{session_id}|{prompt}".encode("utf-8")).hexdigest()
+
+def llm_backoff_delay(attempt):
+    """
+    Returns the delay in seconds before retrying a model call, with random jitter
+    so concurrent invocations don't retry in lockstep.
+    """
+    return min(LLM_BACKOFF_CAP, LLM_BACKOFF_BASE * 2 ** attempt) * (1 + random.random() * 0.5)
+
+def request_deadline(lambda_context=None):
+    """
+    Returns the time.monotonic() deadline for all model calls of a request.
+
+    The deadline is REQUEST_TIME_MARGIN seconds before API Gateway ends the
+    request, or before the Lambda times out if that comes first.
+
+    Args:
+    lambda_context (LambdaContext): The context of the Lambda invocation, if any.
+
+    Returns:
+    float: The deadline, comparable with time.monotonic().
+    """
+    remaining = API_GATEWAY_TIMEOUT
+    if hasattr(lambda_context, 'get_remaining_time_in_millis'):
+        remaining = min(remaining, lambda_context.get_remaining_time_in_millis() / 1000)
+    return time.monotonic() + remaining - REQUEST_TIME_MARGIN
+
+def invoke_with_backoff(prompt, deadline):
+    """
+    Invokes the language model, retrying transient OpenAI errors with
+    jittered exponential backoff until the request deadline.
+
+    Args:
+    prompt (str): The prompt to send to the model.
+    deadline (float): The time.monotonic() deadline of the request (see request_deadline).
+
+    Returns:
+    AIMessage: The model response.
+
+    Raises:
+    TimeoutError: If there isn't enough time left for a model call.
+    """
+    attempt = 0
+    while True:
+        if time.monotonic() + LLM_TIMEOUT > deadline:
+            raise TimeoutError("Not enough time left in the request for a model call.")
+        try:
+            return model.invoke(prompt)
+        except RETRYABLE_LLM_ERRORS:
+            delay = llm_backoff_delay(attempt)
+            # Give up if the next attempt could run past the deadline
+            if time.monotonic() + delay + LLM_TIMEOUT > deadline:
+                raise
+            time.sleep(delay)
+            attempt += 1
+
+def invoke_model(prompt, deadline, user_id=None, session_id=None):
+    """
+    Invokes the language model.
+
+    When a narrative (user_id and session_id) is given, the response is cached
+    in the LLM cache table for LLM_CACHE_TTL seconds, so a resent request for
+    the same narrative and prompt doesn't call the model again.
+
+    Cache errors are not fatal: if the cache table can't be read or written,
+    the model is invoked directly.
+
+    Args:
+    prompt (str): The prompt to send to the model.
+    deadline (float): The time.monotonic() deadline of the request (see request_deadline).
+    user_id (str): Unique identifier for the user (user email), if the response should be cached.
+    session_id (str): Unique identifier for the session, if the response should be cached.
+
+    Returns:
+    str: The model response text.
+    """
+    if user_id is None or session_id is None:
+        return invoke_with_backoff(prompt, deadline).content.strip()
+
+    key = llm_cache_key(prompt, user_id, session_id)
+    now = int(time.time())
+    try:
+        cached = llm_cache_table.get_item(Key={'prompt_hash': key}).get('Item')
+        # DynamoDB TTL deletes expired items lazily, so check the expiry here too
+        if cached and cached.get('expires_at', 0) > now:
+            return cached['response']
+    except ClientError as e:
+        print(f"LLM cache read failed: {e}")
+
+    response_text = invoke_with_backoff(prompt, deadline).content.strip()
+
+    try:
+        llm_cache_table.put_item(Item={
+            'prompt_hash': key,
+            'model': MODEL_NAME,
+            'response': response_text,
+            'timestamp': now,
+            'expires_at': now + LLM_CACHE_TTL
+        })
+    except ClientError as e:
+        print(f"LLM cache write failed: {e}")
+
+    return response_text
+
+def trim_context(text):
+    """
+    Keeps only the last MAX_CONTEXT_WORDS words of the narrative context,
+    so continuation prompts don't grow with the length of the narrative.
+    """
+    words = text.split()
+    if len(words) <= MAX_CONTEXT_WORDS:
+        return text
+    return " ".join(words[-MAX_CONTEXT_WORDS:])
+
+def update_rolling_context(previous_context, response_text, turn, deadline):
+    """
+    Builds the rolling context stored with a narrative after a new turn.
+
+    Every SUMMARY_INTERVAL turns the previous context is replaced by a short
+    summary, keeping the newest segment as is, so the context stays small
+    without losing the start of the story. Other turns just append and trim.
+
+    The summary is only an optimization: if it fails or there is no time left
+    in the request, the context is appended and trimmed instead, so the turn
+    is never lost.
+
+    Args:
+    previous_context (str): The rolling context before this turn.
+    response_text (str): The narrative segment generated in this turn.
+    turn (int): The number of user actions in the narrative, including this one.
+    deadline (float): The time.monotonic() deadline of the request (see request_deadline).
+
+    Returns:
+    str: The new rolling context.
+    """
+    if turn % SUMMARY_INTERVAL == 0:
+        try:
+            summary = invoke_model(SUMMARY_PROMPT_TEMPLATE.format(narrative=previous_context), deadline)
+            return trim_context(f"{summary} {response_text}")
+        except (openai.OpenAIError, TimeoutError) as e:
+            print(f"Rolling context summary failed: {e}")
+    return trim_context(f"{previous_context} {response_text}")
+
+def start_narrative(user_id, session_id, context, deadline=None):
     """
     Initiates a new narrative session in DynamoDB.
 
-    - Checks if a narrative already exists for the given session ID.
-    - If it doesn't exist, generates a descriptive environment and stores it.
+    - Generates a descriptive environment and stores it, unless a narrative
+      already exists for the given session ID (checked atomically on write).
     - If it exists, returns a warning message.
     
     Args:
     user_id (str): Unique identifier for the user (user email).
     session_id (str): Unique identifier for the session.
     context (str): Context to seed the narrative generation.
+    deadline (float): The time.monotonic() deadline for model calls (default: see request_deadline).
 
     Returns:
     dict: The stored narrative item or a warning message.
     """
-    # Check if a narrative already exists for the given session ID
-    existing_session = narrative_table.get_item(
-        Key={'user_id': user_id, 'session_id': session_id}
-        ).get('Item')
-    
-    if existing_session:
-        return {
-            "error": "Narrative already exists for the given session ID. Please use a new dream name."
-            }
+    if deadline is None:
+        deadline = request_deadline()
+
     timestamp = int(time.time())  # Current timestamp for record keeping
     date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-    # Create and format the prompt using the initial template
-    prompt_template = ChatPromptTemplate.from_template(INITIAL_PROMPT_TEMPLATE)
-    prompt = prompt_template.format(context=context)
-    description = model.invoke(prompt).content.strip()
+    # Create and format the prompt using the initial template (the context may be missing from the request)
+    prompt = INITIAL_PROMPT_PREFIX + (context or "") + INITIAL_PROMPT_SUFFIX
+    description = invoke_model(prompt, deadline, user_id, session_id)
 
     # Prepare the item to be stored in the database
+    first_description = f"You open your eyes, this is the first thing that you see...\n\n{description}\n"
     item = {
         'user_id': user_id,
         'session_id': session_id,
         'timestamp': timestamp,
         'date': date,
         'prompt': prompt,
-        'descriptions': [f"You open your eyes, this is the first thing that you see...\n\n{description}\n"],
+        'descriptions': [first_description],
         'actions': [],
+        'rolling_context': trim_context(first_description),
         'is_deleted': False
     }
-    narrative_table.put_item(Item=item)  # Save the item in DynamoDB
+    # Save the item in DynamoDB, only if a narrative doesn't already exist for the given session ID.
+    # The frontend already rejects existing names, so the model is invoked before the write.
+    try:
+        narrative_table.put_item(
+            Item=item,
+            ConditionExpression='attribute_not_exists(user_id) AND attribute_not_exists(session_id)'
+        )
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            return {
+                "error": "Narrative already exists for the given session ID. Please use a new dream name."
+                }
+        raise
     return item
 
 
-def continue_narrative(user_id, session_id, user_action):
+def continue_narrative(user_id, session_id, user_action, deadline=None):
     """
     Continues an existing narrative session by extending the story.
 
     - Retrieves the latest narrative entry from DynamoDB.
-    - Appends the user's action to the narrative and generates the next segment.
-    - Stores the updated narrative in DynamoDB with the session ID and a new timestamp.
+    - Generates the next segment from the stored context and the user's action.
+    - Appends the action and segment to the narrative in DynamoDB in one atomic update.
     
     Args:
     user_id (str): Unique identifier for the user (user email).
     session_id (str): Unique identifier for the session.
     user_action (str): The user's input or action to continue the narrative.
+    deadline (float): The time.monotonic() deadline for model calls (default: see request_deadline).
 
     Returns:
-    dict: The updated narrative item.
+    dict: The updated narrative item, or an error message.
     """
-    # Query the table with both user_id and session_id to ensure the user owns the narrative
-    response = narrative_table.query(
-        KeyConditionExpression=Key('user_id').eq(user_id) & Key('session_id').eq(session_id)
-    )
+    if deadline is None:
+        deadline = request_deadline()
+
+    # Get the narrative by both user_id and session_id to ensure the user owns it.
+    # (user_id, session_id) is the full table key, so this is the latest entry.
+    latest_item = narrative_table.get_item(
+        Key={'user_id': user_id, 'session_id': session_id}
+        ).get('Item')
     
     # Handle case where the session is not found
-    if 'Items' not in response or not response['Items']:
+    if not latest_item:
         return {"error": "Session not found."}
 
-    # Get the most recent narrative entry
-    latest_item = max(response['Items'], key=lambda x: x['timestamp'])
-    previous_descriptions = " ".join(latest_item['descriptions'])
+    # Use the stored rolling context; narratives created before it existed fall back to the descriptions
+    previous_context = latest_item.get('rolling_context') or trim_context(" ".join(latest_item['descriptions']))
 
     # Create a new prompt with the latest user action and previous narrative
-    new_prompt = f"{previous_descriptions}\nUser action: {user_action}\n\n{CONTINUATION_PROMPT_TEMPLATE}"
-    response_text = model.invoke(new_prompt).content.strip()
+    new_prompt = f"{previous_context}\nUser action: {user_action}\n\n{CONTINUATION_PROMPT_TEMPLATE}"
+    response_text = invoke_model(new_prompt, deadline, user_id, session_id)
     
-    # Prepare the new item to update in the database
-    timestamp = int(time.time())
-    new_item = {
-        'user_id': user_id,
-        'session_id': session_id,
-        'timestamp': timestamp,
-        'date': datetime.now().strftime("%Y-%m-%d"),
-        'prompt': new_prompt,
-        'descriptions': latest_item.get('descriptions', []) + [response_text],
-        'actions': latest_item.get('actions', []) + [user_action],
-        'is_deleted': False
-    }
-    narrative_table.put_item(Item=new_item)  # Update the item in DynamoDB
-    return new_item
+    # Append the new turn to the narrative in a single atomic update, so concurrent
+    # turns on the same session can't overwrite each other's actions and descriptions
+    turn = len(latest_item.get('actions', [])) + 1
+    try:
+        response = narrative_table.update_item(
+            Key={'user_id': user_id, 'session_id': session_id},
+            UpdateExpression=(
+                "SET descriptions = list_append(if_not_exists(descriptions, :empty), :description), "
+                "actions = list_append(if_not_exists(actions, :empty), :action), "
+                "rolling_context = :context, prompt = :prompt, #ts = :timestamp, #d = :date, "
+                "is_deleted = :is_deleted"
+            ),
+            ConditionExpression='attribute_exists(session_id)',
+            ExpressionAttributeNames={'#ts': 'timestamp', '#d': 'date'},
+            ExpressionAttributeValues={
+                ':empty': [],
+                ':description': [response_text],
+                ':action': [user_action],
+                ':context': update_rolling_context(previous_context, response_text, turn, deadline),
+                ':prompt': new_prompt,
+                ':timestamp': int(time.time()),
+                ':date': datetime.now().strftime("%Y-%m-%d"),
+                ':is_deleted': False
+            },
+            ReturnValues='ALL_NEW'
+        )
+    except ClientError as e:
+        # The narrative was deleted while the new segment was being generated
+        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            return {"error": "Session not found."}
+        raise
+    return response['Attributes']
 
 
 def delete_narrative(user_id, session_id):
@@ -168,23 +445,25 @@ def delete_narrative(user_id, session_id):
     user_id (str): Unique identifier for the user (user email).
     session_id (str): Unique identifier for the session.
     """
-    # Query the table to get all items for the user and session
+    # Query the table to get the keys of all items for the user and session
     response = narrative_table.query(
-        KeyConditionExpression=Key('user_id').eq(user_id) & Key('session_id').eq(session_id)
+        KeyConditionExpression=Key('user_id').eq(user_id) & Key('session_id').eq(session_id),
+        ProjectionExpression='user_id, session_id'
     )
 
     # Check if any items were found
     if 'Items' not in response or not response['Items']:
         return {"error": "No items found for the given user_id and session_id."}
 
-    # Delete each item
-    for item in response['Items']:
-        narrative_table.delete_item(
-            Key={
-                'user_id': user_id,
-                'session_id': session_id,
-            }
-        )
+    # Delete the items in batches (up to 25 deletes per request)
+    with narrative_table.batch_writer() as batch:
+        for item in response['Items']:
+            batch.delete_item(
+                Key={
+                    'user_id': item['user_id'],
+                    'session_id': item['session_id'],
+                }
+            )
 
     # TODO: Implement logic to move deleted items to a new table
     #* This will be done in a future update. For now, we'll just log this step
@@ -201,6 +480,70 @@ def delete_narrative(user_id, session_id):
     return {"message": f"Successfully deleted narrative session {session_id} for user {user_id}"}
 
 
+def delete_narratives(user_id, session_ids):
+    """
+    Deletes several narrative sessions from DynamoDB in batched writes.
+
+    Deleting a session that doesn't exist is not an error, so every requested
+    session is reported as deleted.
+
+    Args:
+    user_id (str): Unique identifier for the user (user email).
+    session_ids (list): Unique identifiers of the sessions to delete.
+
+    Returns:
+    dict: A message and the session IDs that were deleted, or an error message.
+    """
+    if not session_ids:
+        return {"error": "No session IDs given."}
+
+    # The batch writer groups the deletes into BatchWriteItem requests (up to 25 per request),
+    # dropping duplicate keys that BatchWriteItem would reject
+    with narrative_table.batch_writer(overwrite_by_pkeys=['user_id', 'session_id']) as batch:
+        for session_id in session_ids:
+            batch.delete_item(
+                Key={
+                    'user_id': user_id,
+                    'session_id': session_id,
+                }
+            )
+
+    return {
+        "message": f"Successfully deleted {len(session_ids)} narrative session(s) for user {user_id}",
+        "session_ids": list(session_ids)
+    }
+
+
+def iter_user_narratives(user_id):
+    """
+    Iterates over the active narratives for a given user, one query page at a time.
+
+    DynamoDB returns at most 1 MB per query, so the query is repeated with
+    ExclusiveStartKey until there are no pages left.
+
+    Args:
+    user_id (str): The unique identifier for the user (user email).
+
+    Yields:
+    dict: An active narrative (session_id, date and timestamp).
+    """
+    # Only fetch the fields needed to list narratives, not the prompts and descriptions
+    query_kwargs = {
+        'KeyConditionExpression': Key('user_id').eq(user_id),
+        'FilterExpression': Attr('is_deleted').eq(False),
+        'ProjectionExpression': 'session_id, #d, #ts',
+        'ExpressionAttributeNames': {'#d': 'date', '#ts': 'timestamp'}
+    }
+    response = narrative_table.query(**query_kwargs)
+    yield from response.get('Items', [])
+
+    while 'LastEvaluatedKey' in response:
+        response = narrative_table.query(
+            ExclusiveStartKey=response['LastEvaluatedKey'], **query_kwargs
+        )
+        yield from response.get('Items', [])
+
+
 def get_user_narratives(user_id):
     """
     Retrieves all active narratives for a given user from DynamoDB.
@@ -209,16 +552,12 @@ def get_user_narratives(user_id):
     user_id (str): The unique identifier for the user (user email).
 
     Returns:
-    list: A list of active narrative items for the user.
+    list: A list of active narratives (session_id, date and timestamp) for the user.
     """
-    response = narrative_table.query(
-        KeyConditionExpression=Key('user_id').eq(user_id),
-        FilterExpression=Attr('is_deleted').eq(False)
-    )
-    items = response.get('Items', [])
+    items = list(iter_user_narratives(user_id))
     
     # Convert items to JSON-serializable format
-    return json.loads(json.dumps(items, default=decimal_default))
+    return decimals_to_float(items)
 
 
 def get_narrative_content(user_id, session_id):
@@ -265,7 +604,7 @@ def lambda_handler(event, context):
     Handles incoming Lambda events and routes commands to appropriate functions.
 
     - Supports 'start dreaming', 'continue narrative', 'wake up', 'get narratives',
-      'delete narrative', and 'get narrative content' commands.
+      'delete narrative', 'delete narratives', and 'get narrative content' commands.
     - Extracts command and parameters from the event and processes them accordingly.
     
     Args:
@@ -277,10 +616,13 @@ def lambda_handler(event, context):
     """
     print(f"EVENT_CONTENT: {event}")  # Debug log to check event structure
 
+    # All model calls of this request share one deadline, so together they fit in the API Gateway timeout
+    deadline = request_deadline(context)
+
     # Determine if the event was invoked directly or via API Gateway
     if 'body' in event:
         try:
-            body = json.loads(event['body'])
+            body = json_loads(event['body'])
         except json.JSONDecodeError:
             body = {}
     else:
@@ -291,6 +633,7 @@ def lambda_handler(event, context):
     dream_description = body.get('dream_description')
     user_action = body.get('user_action')
     session_id = body.get('session_id', 'default_session')
+    session_ids = body.get('session_ids', [])
     user_id = body.get('user_id')
 
     print(f"SESSION_ID: {session_id}")  # Debug log to trace session ID
@@ -298,15 +641,17 @@ def lambda_handler(event, context):
     # Route the command to the appropriate function
     result = {}
     if command == "start dreaming":
-        result = start_narrative(user_id, session_id, dream_description)
+        result = start_narrative(user_id, session_id, dream_description, deadline)
     elif command == "continue narrative":
-        result = continue_narrative(user_id, session_id, user_action)
+        result = continue_narrative(user_id, session_id, user_action, deadline)
     elif command == "wake up":
         result = {"message": "You woke up."}
     elif command == "get narratives":
         result = get_user_narratives(user_id)
     elif command == "delete narrative":
         result = delete_narrative(user_id, session_id)
+    elif command == "delete narratives":
+        result = delete_narratives(user_id, session_ids)
     elif command == "get narrative content":
         result = get_narrative_content(user_id, session_id)
     else:
@@ -315,5 +660,5 @@ def lambda_handler(event, context):
     # Return the result as a JSON response
     return {
         'statusCode': 200,
-        'body': json.dumps(result, default=decimal_default)
+        'body': json_dumps(result)
     }
\ No newline at end of file
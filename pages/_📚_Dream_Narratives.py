@@ -7,10 +7,11 @@ a search feature, and narrative management options including deletion.
 """
 
 import pandas as pd
+import pyarrow as pa
 import streamlit as st
 
 from components import auth
-from components.api import delete_narrative, get_narrative_content, get_user_narratives
+from components.api import delete_narratives_batch, get_narrative_content, get_user_narratives
 
 ### --- Page Configuration --- ###
 
@@ -18,9 +19,10 @@ st.set_page_config(page_title="Dream Narratives", page_icon="📚")
 st.markdown("# 📚 Dream Narratives")
 st.sidebar.header("Dream Narratives")
 
-# Check authentication
-if not st.session_state.get("authenticated", False):
+# Check authentication (once per session; later reruns reuse the session state)
+if '_auth_initialized' not in st.session_state:
     auth.set_st_state_vars()
+    st.session_state['_auth_initialized'] = True
 
 # Manage mode
 if 'manage_mode' not in st.session_state:
@@ -58,12 +60,14 @@ def get_narratives_dataframe(user_id):
         st.info("You don't have any dream narratives yet.")
         return None
     
-    df = pd.DataFrame(narratives)
-    df['creation_date'] = pd.to_datetime(df['date']).dt.date
-    df = df.rename(columns={
-        'session_id': 'Narrative Name',
-        'creation_date': 'Creation Date'
-    })
+    # Only keep the columns used by the page, as Arrow-backed columns.
+    # Dates stay datetime64 so sorting is vectorized.
+    schema = pa.schema([('session_id', pa.string()), ('date', pa.string()), ('timestamp', pa.float64())])
+    df = pa.Table.from_pylist(narratives, schema=schema).to_pandas(types_mapper=pd.ArrowDtype)
+    df = df.rename(columns={'session_id': 'Narrative Name'})
+    df['Creation Date'] = pd.to_datetime(df['date'], format='ISO8601', cache=True)
+    # Lowercased names, computed once for case-insensitive search
+    df['_name_lower'] = df['Narrative Name'].str.lower()
     return df
 
 def toggle_manage_mode():
@@ -79,9 +83,6 @@ def set_manage_action(action):
 def set_delete_stage(stage):
     st.session_state.delete_stage = stage
 
-def update_selected_narratives():
-    st.session_state.selected_narratives = st.session_state.multiselect_narratives
-
 def manage_narratives(df, user_id):
     if st.session_state.manage_action is None:
         col1, col2 = st.columns(2)
@@ -112,49 +113,54 @@ def view_narratives(df, user_id):
             descriptions = narrative_content['descriptions']
             actions = narrative_content['actions']
             
+            # Build the whole narrative as a single markdown block
+            parts = []
+            
             # Display the first description (initial model output)
             if descriptions:
-                st.markdown("### 🤖 Dream Begins")
-                st.write(descriptions[0])
+                parts += ["### 🤖 Dream Begins", descriptions[0]]
             
             # Alternate between actions and subsequent descriptions
             for i in range(min(len(actions), len(descriptions) - 1)):
-                st.markdown("---")
-                
-                # User action
-                st.markdown("### 👤 Your Action")
-                st.info(actions[i])
-                
-                # Model response
-                st.markdown("### 🤖 Dream Continues")
-                st.write(descriptions[i + 1])
+                parts += [
+                    "---",
+                    # User action
+                    "### 👤 Your Action",
+                    "> " + actions[i].replace("\n", "\n> "),
+                    # Model response
+                    "### 🤖 Dream Continues",
+                    descriptions[i + 1]
+                ]
             
             # If there are more descriptions than actions, show the last one
             if len(descriptions) > len(actions) + 1:
-                st.markdown("---")
-                st.markdown("### 🤖 Final Dream State")
-                st.write(descriptions[-1])
+                parts += ["---", "### 🤖 Final Dream State", descriptions[-1]]
+            
+            st.markdown("\n\n".join(parts))
                 
         else:
             st.error("Failed to retrieve narrative content or content is incomplete.")
             st.write("Narrative content structure:", narrative_content)
 
 def delete_narratives(df, user_id):
-    st.multiselect(
-        "Select narratives to delete:",
-        options=df['Narrative Name'].tolist(),
-        key="multiselect_narratives",
-        on_change=update_selected_narratives
-    )
+    # The selection is buffered in a form, so picking narratives doesn't rerun the page
+    with st.form("delete_form"):
+        selected = st.multiselect(
+            "Select narratives to delete:",
+            options=df['Narrative Name'].tolist(),
+            key="multiselect_narratives"
+        )
+        submitted = st.form_submit_button("Delete Selected Narratives")
+
+    if submitted:
+        st.session_state.selected_narratives = selected
+        set_delete_stage(1 if selected else 0)
 
     if st.session_state.selected_narratives:
         handle_deletion(user_id)
 
 def handle_deletion(user_id):
-    if st.session_state.delete_stage == 0:
-        if st.button("Delete Selected Narratives", on_click=set_delete_stage, args=(1,)):
-            pass
-    elif st.session_state.delete_stage == 1:
+    if st.session_state.delete_stage == 1:
         st.write("Are you sure you want to delete the selected narratives? This action is permanent.")
         col1, col2 = st.columns(2)
         with col1:
@@ -170,19 +176,15 @@ def handle_deletion(user_id):
         set_delete_stage(0)
 
 def perform_deletion(selected_narratives, user_id):
-    deleted_narratives = []
     st.write("Deleting narratives...")
+    deleted_narratives = delete_narratives_batch(user_id, selected_narratives)
+    if deleted_narratives:
+        # Let the Dream Simulator refetch its known narrative names
+        st.session_state.pop('_known_sessions', None)
+
     for narrative in selected_narratives:
-        result = delete_narrative(user_id, narrative)
-        if result:
-            if ('error' in result and 'No items found' in result['error']) or \
-               ('message' in result and 'Successfully deleted narrative' in result['message']):
-                deleted_narratives.append(narrative)
-                st.success(f"Successfully deleted narrative: {narrative}")
-            else:
-                st.error(f"Unexpected response when deleting narrative '{narrative}'. Response: {result}")
-        else:
-            st.error(f"Failed to delete narrative '{narrative}'. No response received.")
+        if narrative not in deleted_narratives:
+            st.error(f"Failed to delete narrative '{narrative}'.")
     
     if deleted_narratives:
         st.success(f"Successfully deleted {len(deleted_narratives)} narrative(s).")
@@ -192,21 +194,61 @@ def perform_deletion(selected_narratives, user_id):
 
 ### --- Search and Sort --- ###
 
+# Column sorted by for each sort option. Creation dates are sorted by timestamp,
+# since the stored date only has day precision once a narrative is continued.
+SORT_COLUMNS = {"Creation Date": 'timestamp', "Narrative Name": 'Narrative Name'}
+
+def sort_narratives(df, sort_by, ascending):
+    """
+    Sorts the narratives by the given sort option.
+
+    Args:
+        df (pd.DataFrame): The narratives DataFrame.
+        sort_by (str): The sort option ("Creation Date" or "Narrative Name").
+        ascending (bool): Whether to sort in ascending order.
+
+    Returns:
+        pd.DataFrame: The sorted narratives.
+    """
+    return df.sort_values(SORT_COLUMNS[sort_by], ascending=ascending)
+
 def search_and_sort_narratives(df):
     search_term = st.text_input("Search narratives by name:", "")
-    if search_term:
-        df = df[df['Narrative Name'].str.contains(search_term, case=False, na=False)]
-
-    sort_by = st.selectbox("Sort by:", ["Creation Date", "Narrative Name"])
+    sort_by = st.selectbox("Sort by:", list(SORT_COLUMNS))
     sort_order = st.radio("Sort order:", ["Ascending", "Descending"])
 
-    if sort_by == "Creation Date":
-        df = df.sort_values("timestamp", ascending=(sort_order == "Ascending"))
-    else:
-        df = df.sort_values("Narrative Name", ascending=(sort_order == "Ascending"))
+    df = sort_narratives(df, sort_by, sort_order == "Ascending")
+
+    # Filtering with a boolean mask keeps the sorted order
+    if search_term:
+        term = search_term.lower()
+        df = df[df['_name_lower'].str.contains(term, regex=False, na=False)]
 
     return df
 
+### --- Narratives Table --- ###
+
+def show_narratives_table(df):
+    # Build the Arrow table Streamlit sends to the frontend directly from the two
+    # displayed columns, instead of slicing the DataFrame and converting it
+    data = pa.table({
+        'Narrative Name': pa.array(df['Narrative Name']),
+        'Creation Date': pa.array(df['Creation Date'])
+    })
+    st.dataframe(
+        data,
+        column_config={'Creation Date': st.column_config.DateColumn()}
+    )
+
+@st.fragment
+def narratives_view(df):
+    """
+    Search/sort widgets and the narratives table. Runs as a fragment, so
+    interacting with these widgets only reruns this part of the page.
+    """
+    df = search_and_sort_narratives(df)
+    show_narratives_table(df)
+
 ### --- Main App --- ###
 
 def main():
@@ -227,10 +269,9 @@ def main():
 
             if st.session_state.manage_mode:
                 manage_narratives(df, user_id)
+                show_narratives_table(df)
             else:
-                df = search_and_sort_narratives(df)
-
-            st.dataframe(df[['Narrative Name', 'Creation Date']])
+                narratives_view(df)
     else:
         st.write("Please log in to view your dream narratives.")
 
@@ -11,16 +11,18 @@ Usage:
 To run this script, execute `python app.py` in the terminal.
 """
 
-from datetime import datetime
+import time
 
 import streamlit as st
 
 import components.auth as auth  # noqa: F401
+from components.config import env
 from components.api import (  # noqa: F401
     continue_narrative,
-    get_user_narratives,
+    get_user_session_ids,
+    prefetch_user_narratives,
     start_narrative,
-    wake_up,
+    wake_up_in_background,
 )
 
 ### --- Page Configuration --- ###
@@ -33,9 +35,10 @@ st.set_page_config(
 st.markdown("# 🤖​💬 Dream Simulator")
 st.sidebar.header("Dream Simulator")
 
-# Check authentication
-if not st.session_state.get("authenticated", False):
+# Check authentication (once per session; later reruns reuse the session state)
+if '_auth_initialized' not in st.session_state:
     auth.set_st_state_vars()
+    st.session_state['_auth_initialized'] = True
 
 # Add login/logout button
 if st.session_state.get("authenticated", False):
@@ -47,8 +50,23 @@ else:
 # Get user id (user email)
 user_id = st.session_state.get("user_email", "")
 
+# Fetch the user's narratives in the background while the page renders
+if '_narratives_prefetched' not in st.session_state:
+    prefetch_user_narratives(user_id)
+    st.session_state['_narratives_prefetched'] = True
+
 ### --- Helper Functions --- ###
 
+def empty_messages():
+    """
+    Returns an empty session history.
+
+    The history is stored as parallel lists (one per field) rather than a list
+    of dicts, so rendering and filtering read straight from each list.
+    """
+    return {'timestamp': [], 'role': [], 'action_type': [], 'content': []}
+
+
 def add_to_messages(role, action_type, content):
     """
     Adds an entry to the session history.
@@ -58,14 +76,11 @@ def add_to_messages(role, action_type, content):
         action_type (str): Indicates whether it's a 'user_action' or 'model_description'.
         content (str): The content of the action or response.
     """
-    entry = {
-        'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        'role': role,
-        'action_type': action_type,
-        'content': content
-    }
-
-    st.session_state.messages.append(entry)
+    messages = st.session_state.messages
+    messages['timestamp'].append(time.time())  # Epoch seconds; format only if displayed
+    messages['role'].append(role)
+    messages['action_type'].append(action_type)
+    messages['content'].append(content)
 
 
 def handle_assistant_response(response_data):
@@ -96,6 +111,9 @@ def handle_start_narrative(user_id, session_id, narrative_input):
     """
     response_data = start_narrative(user_id, session_id, narrative_input)
     handle_assistant_response(response_data)
+    if response_data and 'error' not in response_data and '_known_sessions' in st.session_state:
+        # Record the new narrative without refetching the user's narratives
+        st.session_state['_known_sessions'] |= {session_id}
     st.session_state.narrative_started = True  # Narrative started
 
 
@@ -115,30 +133,39 @@ def handle_continue_narrative(user_id, session_id, narrative_input):
 def handle_wake_up():
     """
     Ends the narrative by sending a 'wake up' command to the API and resets the session state.
+
+    The command is sent in the background; the history is reset right away, so
+    there is nothing to show from its response.
     """
-    response_data = wake_up()
-    if response_data:
-        add_to_messages('assistant', 'model_description', response_data.get('message', 'Woke up'))
+    wake_up_in_background()
     # Reset session state
     st.session_state.session_id = ""
-    st.session_state.messages = []
+    st.session_state.messages = empty_messages()
     st.session_state.narrative_started = False
     st.rerun()
 
 
-def is_valid_session_id(user_id, session_id):
+def get_known_sessions(user_id):
     """
-    Checks if the given session_id is valid (not already registered in DynamoDB).
-    
+    Returns the user's narrative names, kept in the session state.
+
+    The set is fetched once and then kept up to date when narratives are created
+    here or deleted from the Dream Narratives page, so checking a name while
+    typing doesn't need a lookup.
+
     Args:
         user_id (str): The ID of the user (email).
-        session_id (str): The session ID to check.
-    
+
     Returns:
-        bool: True if the session_id is valid, False otherwise.
+        frozenset: The session IDs of the user's narratives.
     """
-    existing_narratives = get_user_narratives(user_id)
-    return not any(narrative['session_id'] == session_id for narrative in existing_narratives)
+    if '_known_sessions' not in st.session_state:
+        session_ids = get_user_session_ids(user_id)
+        if session_ids is None:
+            # Don't keep a failed lookup, so the next check fetches the names again
+            return frozenset()
+        st.session_state['_known_sessions'] = session_ids
+    return st.session_state['_known_sessions']
 
 def is_existing_narrative(user_id, session_id):
     """
@@ -151,8 +178,7 @@ def is_existing_narrative(user_id, session_id):
     Returns:
         bool: True if the narrative exists, False otherwise.
     """
-    existing_narratives = get_user_narratives(user_id)
-    return any(narrative['session_id'] == session_id for narrative in existing_narratives)
+    return session_id in get_known_sessions(user_id)
 
 ### --- Session States Initialization --- ###
 
@@ -162,7 +188,7 @@ if 'session_id' not in st.session_state:
 
 # Initialize chat history
 if 'messages' not in st.session_state:
-    st.session_state.messages = []
+    st.session_state.messages = empty_messages()
     
 # Narrative started flag
 if 'narrative_started' not in st.session_state:
@@ -193,9 +219,9 @@ if st.session_state.get("authenticated", False):
         st.write(f"**Narrative Name:** {st.session_state.session_id}")
 
     # Display chat messages from history on app rerun
-    for message in st.session_state.messages:
-        with st.chat_message(message["role"]):
-            st.markdown(message["content"])
+    messages = st.session_state.messages
+    for role, content in zip(messages['role'], messages['content']):
+        st.chat_message(role).markdown(content)
 
     # Show chat input if a valid session_id is set and narrative is started
     if st.session_state.session_id and st.session_state.narrative_started:
@@ -204,7 +230,7 @@ if st.session_state.get("authenticated", False):
             with st.chat_message("user"):
                 st.markdown(prompt)
             # Start or continue narrative as appropriate
-            if len(st.session_state.messages) == 0:
+            if not st.session_state.messages['content']:
                 add_to_messages("user", "dream_description", prompt)
                 handle_start_narrative(user_id, st.session_state.session_id, prompt)
             else:
@@ -222,5 +248,6 @@ if st.session_state.get("authenticated", False):
 else:
     st.write("Please log in to use the Dream Simulator.")
 
-#! Debug
-# st.write(st.session_state)
\ No newline at end of file
+#! Debug (only with DREAMDX_DEBUG=1)
+if env()["DEBUG"]:
+    st.write(st.session_state)
\ No newline at end of file